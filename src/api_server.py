@@ -64,7 +64,7 @@ class APIServer:
                 'status': 'healthy',
                 'timestamp': time.time(),
                 'version': self.api_config.get('version', 'v1'),
-                'streams': len(self.stream_manager.get_all_streams())
+                'streams': self.stream_manager.get_stream_count()
             })
         
         # ========== 算法查询接口 ==========
@@ -171,8 +171,14 @@ class APIServer:
                         'message': 'type参数错误，必须为1、2或3'
                     }), 400
                 
+                # 验证算法已配置（未配置时不应停止同 sceneId 的旧场景）
+                scene_manager = self.stream_manager.scene_manager
+                if not scene_manager.scene_mapper.validate_algorithm(algorithm_code):
+                    # 与 deploy_scene 的失败结果共用同一构建方法
+                    return jsonify(scene_manager._algorithm_missing_result(algorithm_code, devices)), 400
+                
                 # 调用场景管理器处理
-                result = self.stream_manager.scene_manager.deploy_scene_v2(
+                result = scene_manager.deploy_scene_v2(
                     scene_id=scene_id,
                     algorithm_code=algorithm_code,
                     devices=devices,
@@ -905,7 +905,6 @@ class DetectionEngine:
             return True
         
         try:
-            from datetime import datetime
             now = datetime.now()
             current_month = now.month
             current_time = now.time()
@@ -6,7 +6,7 @@
 import threading
 import time
 import logging
-from typing import Dict, Set
+from typing import Dict, List, Set
 from .device_platform_client import DevicePlatformClient
 
 
@@ -28,6 +28,7 @@ class HeartbeatManager:
         # 心跳线程管理
         self.heartbeat_threads: Dict[str, threading.Thread] = {}
         self.heartbeat_stop_flags: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()  # 保护心跳线程的注册与移除（场景部署会并发调用）
         
         # 心跳统计
         self.heartbeat_success_count: Dict[str, int] = {}
@@ -46,6 +47,27 @@ class HeartbeatManager:
         Returns:
             是否成功启动
         """
+        with self._lock:
+            return self._start_heartbeat_locked(device_gb_code)
+    
+    def start_heartbeats(self, device_gb_codes: List[str]) -> int:
+        """
+        批量启动设备心跳（只获取一次锁）
+        
+        Args:
+            device_gb_codes: 设备国标编码列表
+            
+        Returns:
+            成功启动的心跳数量
+        """
+        with self._lock:
+            return sum(
+                self._start_heartbeat_locked(device_gb_code)
+                for device_gb_code in device_gb_codes
+            )
+    
+    def _start_heartbeat_locked(self, device_gb_code: str) -> bool:
+        """启动设备心跳（调用方需持有 _lock）"""
         if device_gb_code in self.heartbeat_threads:
             self.logger.warning(f"设备 {device_gb_code} 心跳已在运行")
             return False
@@ -83,24 +105,23 @@ class HeartbeatManager:
         Returns:
             是否成功停止
         """
-        if device_gb_code not in self.heartbeat_threads:
+        # 先移除登记（在锁内完成），再在锁外等待线程退出
+        with self._lock:
+            thread = self.heartbeat_threads.pop(device_gb_code, None)
+            stop_flag = self.heartbeat_stop_flags.pop(device_gb_code, None)
+        
+        if thread is None:
             self.logger.warning(f"设备 {device_gb_code} 心跳未运行")
             return False
         
         # 设置停止标志
-        stop_flag = self.heartbeat_stop_flags.get(device_gb_code)
         if stop_flag:
             stop_flag.set()
         
         # 等待线程结束
-        thread = self.heartbeat_threads.get(device_gb_code)
-        if thread and thread.is_alive():
+        if thread.is_alive():
             thread.join(timeout=2.0)
         
-        # 清理
-        self.heartbeat_threads.pop(device_gb_code, None)
-        self.heartbeat_stop_flags.pop(device_gb_code, None)
-        
         self.logger.info(f"设备 {device_gb_code} 心跳线程已停止")
         return True
     
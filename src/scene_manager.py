@@ -3,11 +3,19 @@
 负责处理场景下发、设备管理等业务逻辑
 """
 
+import calendar
+import heapq
+import itertools
 import logging
-from typing import Dict, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 
+from .config_manager import config_manager
 from .device_platform_client import DevicePlatformClient, StreamAddress
 from .heartbeat_manager import HeartbeatManager
 from .scene_mapper import SceneMapper
@@ -15,7 +23,32 @@ from .stream_manager import StreamManager, StreamConfig
 from .region_filter import RegionFilter
 
 
-@dataclass
+# 单次场景部署并发处理的最大设备数
+_MAX_DEPLOY_WORKERS = 16
+
+# 场景操作锁的分段数（按 sceneId 哈希分段，锁数量固定）
+_SCENE_LOCK_STRIPES = 64
+
+# 算法未配置模型时的失败原因模板
+_ALGO_MISSING_REASON_TMPL = '算法 "{}" 未配置模型'.format
+
+
+@lru_cache(maxsize=32)
+def _month_last_day(year: int, month: int) -> int:
+    """
+    获取指定年月的最后一天（按年月缓存）
+    
+    Args:
+        year: 年份
+        month: 月份
+        
+    Returns:
+        该月天数
+    """
+    return calendar.monthrange(year, month)[1]
+
+
+@dataclass(frozen=True, slots=True)
 class DeviceInfo:
     """设备信息"""
     device_gb_code: str  # 设备国标编码
@@ -24,7 +57,7 @@ class DeviceInfo:
     stream_id: Optional[str] = None  # 内部流ID
 
 
-@dataclass
+@dataclass(slots=True)
 class SceneDeployment:
     """场景部署信息"""
     scene: str  # 场景名称
@@ -40,6 +73,7 @@ class SceneDeployment:
     daily_time_start: Optional[str] = None  # 每日开始时间 HH:mm:ss（Type 2和3）
     daily_time_end: Optional[str] = None  # 每日结束时间 HH:mm:ss（Type 2和3）
     scene_id: Optional[str] = None  # 外部场景ID（用于场景启停）
+    end_ts: float = 0.0  # 结束时间戳（部署时由 end_date 解析一次）
 
 
 class SceneManager:
@@ -69,7 +103,25 @@ class SceneManager:
         self.region_filter = RegionFilter()
         
         # 部署记录（直接使用 sceneId 作为 key）
+        # 写时复制：写入方在锁内整体替换字典，读取方（如到期监控线程）无需加锁
         self.deployments: Dict[str, SceneDeployment] = {}  # sceneId -> deployment
+        self._deployments_lock = threading.Lock()
+        # 部署信息缓存（部署时构建一次，停止时移除；与 deployments 一样写时复制）
+        self._info_cache: Dict[str, Dict] = {}  # deployment_id -> 部署信息字典
+        # 设备索引：deviceGbCode -> 包含该设备的 deployment_id 集合（受 _deployments_lock 保护）
+        self._device_index: Dict[str, Set[str]] = {}
+        # 未提供 sceneId 时生成部署ID用的序号
+        self._id_counter = itertools.count()
+        
+        # 到期时间最小堆 (结束时间戳, deployment_id)，停止部署时不删除（惰性删除）
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._heap_lock = threading.Lock()
+        self._wake = threading.Event()
+        # 最长休眠时间：到期时间按墙上时钟计算，定期醒来以兜底系统时间被调整的情况
+        self._monitor_interval = config_manager.get('scene.monitor_interval', 30)
+        
+        # 场景操作锁：按 sceneId 哈希分段，串行化同一场景的停止与"先停止再下发"（可重入），不同场景基本互不阻塞
+        self._scene_locks: List[threading.RLock] = [threading.RLock() for _ in range(_SCENE_LOCK_STRIPES)]
         
         # 启动场景到期检查线程
         self.monitor_running = False
@@ -80,7 +132,6 @@ class SceneManager:
     
     def _start_expiration_monitor(self):
         """启动场景到期监控线程"""
-        import threading
         self.monitor_running = True
         self.monitor_thread = threading.Thread(
             target=self._expiration_monitor_worker,
@@ -91,50 +142,56 @@ class SceneManager:
         self.logger.info("场景到期监控已启动")
     
     def _expiration_monitor_worker(self):
-        """场景到期监控工作线程"""
-        import time
-        from datetime import datetime
-        
+        """场景到期监控工作线程（休眠至最近的到期时间，新部署或停止时被唤醒）"""
         while self.monitor_running:
             try:
-                current_time = datetime.now()
-                expired_scenes = []
+                with self._heap_lock:
+                    if self._expiry_heap:
+                        timeout = min(max(0.0, self._expiry_heap[0][0] - time.time()),
+                                      self._monitor_interval)
+                    else:
+                        timeout = None
                 
-                # 检查所有部署的场景（使用 list() 创建副本，避免遍历时修改字典）
-                for deployment_id, deployment in list(self.deployments.items()):
-                    try:
-                        # 解析结束时间
-                        end_time = datetime.strptime(deployment.end_date, "%Y-%m-%d %H:%M:%S")
-                        
-                        # 如果已到期
-                        if current_time >= end_time:
-                            expired_scenes.append(deployment_id)
-                            self.logger.info(
-                                f"场景已到期: {deployment_id}, "
-                                f"算法={deployment.algorithm}, "
-                                f"结束时间={deployment.end_date}"
-                            )
-                    except Exception as e:
-                        self.logger.error(f"解析场景时间失败: {deployment_id}, {e}")
+                self._wake.wait(timeout)
+                self._wake.clear()
+                if not self.monitor_running:
+                    break
+                
+                # 弹出所有已到期的条目
+                now = time.time()
+                due = []
+                with self._heap_lock:
+                    while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                        due.append(heapq.heappop(self._expiry_heap))
                 
-                # 停止到期的场景
-                for deployment_id in expired_scenes:
+                for end_ts, deployment_id in due:
+                    deployment = self.deployments.get(deployment_id)
+                    if deployment is None:
+                        # 部署已停止，丢弃过期的堆条目
+                        continue
+                    
+                    # 同一 sceneId 可能已按新的结束时间重新部署
+                    if deployment.end_ts > now:
+                        continue
+                    
+                    self.logger.info(
+                        "场景已到期: %s, 算法=%s, 结束时间=%s",
+                        deployment_id, deployment.algorithm, deployment.end_date
+                    )
                     try:
-                        self.stop_scene(deployment_id)
-                        self.logger.info(f"已自动停止到期场景: {deployment_id}")
+                        if self.stop_deployment(deployment_id):
+                            self.logger.info("已自动停止到期场景: %s", deployment_id)
                     except Exception as e:
-                        self.logger.error(f"停止到期场景失败: {deployment_id}, {e}")
-                
-                # 每30秒检查一次
-                time.sleep(30)
+                        # 条目已出堆，单个场景失败不能影响同批其他到期场景
+                        self.logger.error("停止到期场景失败: %s, %s", deployment_id, e, exc_info=True)
                 
             except Exception as e:
-                self.logger.error(f"场景到期监控异常: {e}", exc_info=True)
-                time.sleep(30)
+                self.logger.error("场景到期监控异常: %s", e, exc_info=True)
     
     def stop(self):
         """停止场景管理器"""
         self.monitor_running = False
+        self._wake.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=5)
         self.logger.info("场景管理器已停止")
@@ -150,7 +207,8 @@ class SceneManager:
         allowed_months: List[int] = None,
         daily_time_start: str = "",
         daily_time_end: str = "",
-        scene_id: str = None  # 新增：外部 sceneId
+        scene_id: str = None,  # 新增：外部 sceneId
+        end_ts: Optional[float] = None
     ) -> Dict:
         """
         部署场景
@@ -165,134 +223,98 @@ class SceneManager:
             allowed_months: 允许的月份列表（可选）
             daily_time_start: 每日开始时间（可选）
             daily_time_end: 每日结束时间（可选）
+            scene_id: 外部场景ID（可选）
+            end_ts: 已解析的结束时间戳（可选，未提供时由 end_date 解析）
             
         Returns:
             部署结果字典
         """
-        self.logger.info(f"开始部署场景: {scene}, 算法: {algorithm}, 设备数: {len(devices)}, 时间类型: {date_type}")
+        self.logger.info(
+            "开始部署场景: %s, 算法: %s, 设备数: %d, 时间类型: %s",
+            scene, algorithm, len(devices), date_type
+        )
         
-        # 1. 根据算法名称获取模型路径（忽略scene字段）
-        model_path = self.scene_mapper.get_model_by_algorithm(algorithm)
+        # 0. 解析结束时间（只解析一次，供到期监控直接比较时间戳；调用方已解析时直接使用）
+        if end_ts is None:
+            end_ts = self._parse_end_date(end_date)
+            if end_ts is None:
+                message = f'结束时间格式错误: {end_date}'
+                return self._all_devices_failed(message, message, devices)
         
-        if not model_path:
-            return {
-                'status': 1,
-                'message': f'未找到算法 "{algorithm}" 对应的模型',
-                'data': {
-                    'deployed_devices': 0,
-                    'failed_devices': len(devices),
-                    'failed_list': [
-                        {
-                            'deviceGbCode': dev.get('deviceGbCode'),
-                            'reason': f'算法 "{algorithm}" 未配置模型'
-                        }
-                        for dev in devices
-                    ]
-                }
-            }
+        # 1. 根据算法名称一次性解析模型路径、目标类别、自定义处理类型（忽略scene字段）
+        resolved = self.scene_mapper.resolve(algorithm)
         
-        # 2. 获取目标检测类别（可选）
-        target_classes = self.scene_mapper.get_target_classes_by_algorithm(algorithm)
+        if resolved is None:
+            return self._algorithm_missing_result(algorithm, devices)
         
-        # 2.1 获取自定义处理类型（可选）
-        custom_type = self.scene_mapper.get_custom_type_by_algorithm(algorithm)
+        # 2. 目标检测类别、自定义处理类型均为可选
+        model_path, target_classes, custom_type = resolved
         
-        # 3. 逐个部署设备
+        # 3. 检查设备是否已在其他场景中部署（通过设备索引直接查找，无需遍历所有部署）
+        self._warn_overlapping_devices(devices, scene_id)
+        
+        # 4. 并发部署设备（获取流地址、打开视频流均为阻塞I/O，设备之间相互独立）
         deployed_devices = []
         failed_devices = []
         
-        for device_data in devices:
-            device_gb_code = device_data.get('deviceGbCode')
-            area = device_data.get('area', '')
-            
-            try:
-                # 3.1 获取流地址
-                stream_addr = self.device_client.get_play_url(device_gb_code)
-
-                if not stream_addr or not stream_addr.rtmp:
-                    failed_devices.append({
-                        'deviceGbCode': device_gb_code,
-                        'reason': '获取RTMP流地址失败'
-                    })
-                    continue
-                
-                # 3.2 生成内部流ID
-                stream_id = f"scene_{scene}_{device_gb_code}".replace(' ', '_')
-                self.logger.info(f'获取流地址成功:{stream_id}')
-
-                # 3.3 注册视频流
-                # 从配置文件读取FPS限制（5秒1帧 = 0.2 FPS）
-                from .config_manager import config_manager
-                detection_params = config_manager.get_detection_params()
-                
-                stream_config = StreamConfig(
-                    stream_id=stream_id,
-                    rtsp_url=stream_addr.rtmp,  # 注意：字段名保持rtsp_url但实际使用RTMP流
-                    name=f"{scene}_{device_gb_code}",
-                    description=f"场景: {scene}, 设备: {device_gb_code}",
-                    confidence_threshold=detection_params.get('confidence_threshold', 0.5),
-                    iou_threshold=detection_params.get('iou_threshold', 0.45),
-                    fps_limit=detection_params.get('fps_limit', 1),  # 关键：使用配置的FPS限制
-                    model_path=model_path,
-                    target_classes=target_classes,
-                    custom_type=custom_type if custom_type else "",  # 关键：每个流使用自己的custom_type
-                    scene_id=scene_id if scene_id else "",  # 关键：保存场景ID用于告警通知
-                    alarm_enabled=True,
-                    save_results=True,
-                    # 时间策略配置
-                    date_type=date_type,
-                    allowed_months=allowed_months if allowed_months else [],
-                    daily_time_start=daily_time_start,
-                    daily_time_end=daily_time_end
-                )
-                
-                register_result = self.stream_manager.register_stream(stream_config)
-                if not register_result.get('success'):
-                    failed_devices.append({
-                        'deviceGbCode': device_gb_code,
-                        'reason': f"注册流失败: {register_result.get('error', '未知错误')}"
-                    })
-                    continue
-                self.logger.info(f'注册流成功:{stream_id}')
-                
-                # 3.4 启动检测
-                start_result = self.stream_manager.start_stream(stream_id)
-                if not start_result.get('success'):
-                    # 启动失败，清理已注册的流
-                    self.stream_manager.unregister_stream(stream_id)
-                    failed_devices.append({
-                        'deviceGbCode': device_gb_code,
-                        'reason': f"启动流失败: {start_result.get('error', '未知错误')}"
-                    })
-                    continue
-                self.logger.info(f'启动流成功:{stream_id}')
-
-                # 3.5 启动心跳
-                self.heartbeat_manager.start_heartbeat(device_gb_code)
-                
-                # 记录部署成功
-                device_info = DeviceInfo(
-                    device_gb_code=device_gb_code,
-                    area=area,
-                    stream_addr=stream_addr,
-                    stream_id=stream_id
-                )
-                deployed_devices.append(device_info)
-                self.logger.info(f"设备 {device_gb_code} 部署成功")
-                
-            except Exception as e:
-                self.logger.error(f"设备 {device_gb_code} 部署失败: {e}")
-                failed_devices.append({
-                    'deviceGbCode': device_gb_code,
-                    'reason': str(e)
-                })
+        # 场景名对所有设备相同，流ID中的空格替换只需做一次
+        safe_scene = scene.replace(' ', '_')
+        
+        # 各设备共用的流配置参数（与设备无关，只计算一次）
+        # 从配置文件读取FPS限制（5秒1帧 = 0.2 FPS）
+        detection_params = config_manager.get_detection_params()
+        stream_params = {
+            'confidence_threshold': detection_params.get('confidence_threshold', 0.5),
+            'iou_threshold': detection_params.get('iou_threshold', 0.45),
+            'fps_limit': detection_params.get('fps_limit', 1),  # 关键：使用配置的FPS限制
+            'model_path': model_path,
+            'target_classes': target_classes,
+            'custom_type': custom_type if custom_type else "",  # 关键：每个流使用自己的custom_type
+            'scene_id': scene_id if scene_id else "",  # 关键：保存场景ID用于告警通知
+            'alarm_enabled': True,
+            'save_results': True,
+            # 时间策略配置
+            'date_type': date_type,
+            'allowed_months': allowed_months if allowed_months else [],
+            'daily_time_start': daily_time_start,
+            'daily_time_end': daily_time_end
+        }
         
-        # 4. 记录部署信息（只有成功部署至少一个设备时才注册）
-        # 使用 sceneId 作为 key（如果提供），否则生成带时间戳的 ID
+        if devices:
+            with ThreadPoolExecutor(
+                max_workers=min(_MAX_DEPLOY_WORKERS, len(devices)),
+                thread_name_prefix="SceneDeploy"
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        self._deploy_one_device,
+                        device_data,
+                        scene,
+                        safe_scene,
+                        stream_params
+                    )
+                    for device_data in devices
+                ]
+                # 按设备下发顺序收集结果
+                for future in futures:
+                    device_info, failure = future.result()
+                    if device_info is not None:
+                        deployed_devices.append(device_info)
+                    else:
+                        failed_devices.append(failure)
+        
+        # 3.5 批量启动部署成功设备的心跳
+        if deployed_devices:
+            self.heartbeat_manager.start_heartbeats(
+                [device_info.device_gb_code for device_info in deployed_devices]
+            )
+        
+        # 5. 记录部署信息（只有成功部署至少一个设备时才注册）
+        # 使用 sceneId 作为 key（如果提供），否则生成 纳秒时间戳+序号 的唯一 ID
         if scene_id:
             deployment_id = scene_id
         else:
-            deployment_id = f"{scene}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+            deployment_id = f"{safe_scene}_{time.time_ns():x}_{next(self._id_counter):x}"
         
         if len(deployed_devices) > 0:
             deployment = SceneDeployment(
@@ -303,11 +325,27 @@ class SceneManager:
                 devices=deployed_devices,
                 model_path=model_path,
                 target_classes=target_classes,
-                scene_id=scene_id  # 保存 sceneId
+                date_type=date_type,
+                allowed_months=allowed_months,
+                daily_time_start=daily_time_start,
+                daily_time_end=daily_time_end,
+                scene_id=scene_id,  # 保存 sceneId
+                end_ts=end_ts
             )
-            self.deployments[deployment_id] = deployment
+            with self._deployments_lock:
+                previous = self.deployments.get(deployment_id)
+                if previous is not None:
+                    self._unindex_devices(deployment_id, previous)
+                self.deployments = {**self.deployments, deployment_id: deployment}
+                self._info_cache = {
+                    **self._info_cache,
+                    deployment_id: self._build_deployment_info(deployment_id, deployment)
+                }
+                for device_info in deployed_devices:
+                    self._device_index.setdefault(device_info.device_gb_code, set()).add(deployment_id)
+            self._schedule_expiration(deployment_id, end_ts)
         
-        # 5. 返回结果
+        # 6. 返回结果
         result = {
             'status': 0 if len(deployed_devices) > 0 else 1,
             'message': '场景部署成功' if len(deployed_devices) > 0 else '场景部署失败',
@@ -320,11 +358,170 @@ class SceneManager:
         }
         
         self.logger.info(
-            f"场景部署完成: 成功{len(deployed_devices)}个, 失败{len(failed_devices)}个"
+            "场景部署完成: 成功%d个, 失败%d个",
+            len(deployed_devices), len(failed_devices)
         )
         
         return result
     
+    @staticmethod
+    def _parse_end_date(end_date: str) -> Optional[float]:
+        """
+        解析结束时间为时间戳
+        
+        Args:
+            end_date: 结束时间，格式 yyyy-MM-dd HH:mm:ss
+            
+        Returns:
+            结束时间戳，格式错误时返回None
+        """
+        try:
+            return datetime.strptime(end_date, "%Y-%m-%d %H:%M:%S").timestamp()
+        except (TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def _all_devices_failed(message: str, reason: str, devices: List[Dict]) -> Dict:
+        """
+        构建所有设备均部署失败的结果
+        
+        Args:
+            message: 结果消息
+            reason: 每个设备的失败原因
+            devices: 设备列表
+            
+        Returns:
+            部署结果字典
+        """
+        return {
+            'status': 1,
+            'message': message,
+            'data': {
+                'deployed_devices': 0,
+                'failed_devices': len(devices),
+                'failed_list': [
+                    {'deviceGbCode': dev.get('deviceGbCode'), 'reason': reason}
+                    for dev in devices
+                ]
+            }
+        }
+    
+    @classmethod
+    def _algorithm_missing_result(cls, algorithm: str, devices: List[Dict]) -> Dict:
+        """
+        构建算法未配置模型时的部署失败结果（部署与API预检查共用）
+        
+        Args:
+            algorithm: 算法名称
+            devices: 设备列表
+            
+        Returns:
+            部署结果字典
+        """
+        # 所有设备共用同一个失败原因字符串，只格式化一次
+        return cls._all_devices_failed(
+            f'未找到算法 "{algorithm}" 对应的模型',
+            _ALGO_MISSING_REASON_TMPL(algorithm),
+            devices
+        )
+    
+    def _deploy_one_device(
+        self,
+        device_data: Dict,
+        scene: str,
+        safe_scene: str,
+        stream_params: Dict[str, Any]
+    ) -> Tuple[Optional[DeviceInfo], Optional[Dict]]:
+        """
+        部署单个设备（在部署线程池中执行）
+        
+        Args:
+            device_data: 设备数据，包含deviceGbCode和area字段
+            scene: 场景名称
+            safe_scene: 已将空格替换为下划线的场景名称（用于生成流ID）
+            stream_params: 各设备共用的 StreamConfig 参数
+            
+        Returns:
+            (设备信息, None) 表示部署成功；(None, 失败信息) 表示部署失败
+        """
+        device_gb_code = device_data.get('deviceGbCode')
+        area = device_data.get('area', '')
+        
+        try:
+            # 3.1 获取流地址
+            stream_addr = self.device_client.get_play_url(device_gb_code)
+            
+            if not stream_addr or not stream_addr.rtmp:
+                return None, {
+                    'deviceGbCode': device_gb_code,
+                    'reason': '获取RTMP流地址失败'
+                }
+            
+            # 3.2 生成内部流ID
+            stream_id = f"scene_{safe_scene}_{device_gb_code.replace(' ', '_')}"
+            self.logger.info('获取流地址成功:%s', stream_id)
+            
+            # 3.3 注册视频流
+            stream_config = StreamConfig(
+                stream_id=stream_id,
+                rtsp_url=stream_addr.rtmp,  # 注意：字段名保持rtsp_url但实际使用RTMP流
+                name=f"{scene}_{device_gb_code}",
+                description=f"场景: {scene}, 设备: {device_gb_code}",
+                **stream_params
+            )
+            
+            register_result = self.stream_manager.register_stream(stream_config)
+            if not register_result.get('success'):
+                return None, {
+                    'deviceGbCode': device_gb_code,
+                    'reason': f"注册流失败: {register_result.get('error', '未知错误')}"
+                }
+            self.logger.info('注册流成功:%s', stream_id)
+            
+            # 3.4 启动检测
+            start_result = self.stream_manager.start_stream(stream_id)
+            if not start_result.get('success'):
+                # 启动失败，清理已注册的流
+                self.stream_manager.unregister_stream(stream_id)
+                return None, {
+                    'deviceGbCode': device_gb_code,
+                    'reason': f"启动流失败: {start_result.get('error', '未知错误')}"
+                }
+            self.logger.info('启动流成功:%s', stream_id)
+            
+            # 记录部署成功
+            device_info = DeviceInfo(
+                device_gb_code=device_gb_code,
+                area=area,
+                stream_addr=stream_addr,
+                stream_id=stream_id
+            )
+            self.logger.info("设备 %s 部署成功", device_gb_code)
+            return device_info, None
+            
+        except Exception as e:
+            self.logger.error("设备 %s 部署失败: %s", device_gb_code, e)
+            return None, {
+                'deviceGbCode': device_gb_code,
+                'reason': str(e)
+            }
+    
+    def _schedule_expiration(self, deployment_id: str, end_ts: float) -> None:
+        """
+        登记部署的到期时间，仅当它成为最早的到期时间时才唤醒到期监控线程
+        
+        Args:
+            deployment_id: 部署ID
+            end_ts: 结束时间戳
+        """
+        entry = (end_ts, deployment_id)
+        with self._heap_lock:
+            heapq.heappush(self._expiry_heap, entry)
+            is_earliest = self._expiry_heap[0] == entry
+        
+        if is_earliest:
+            self._wake.set()
+    
     def get_deployment_info(self, deployment_id: str) -> Optional[Dict]:
         """
         获取部署信息
@@ -335,10 +532,20 @@ class SceneManager:
         Returns:
             部署信息字典
         """
-        deployment = self.deployments.get(deployment_id)
-        if not deployment:
-            return None
+        return self._info_cache.get(deployment_id)
+    
+    @staticmethod
+    def _build_deployment_info(deployment_id: str, deployment: SceneDeployment) -> Dict:
+        """
+        构建部署信息字典（部署完成后 devices 不再变化，结果可直接缓存）
         
+        Args:
+            deployment_id: 部署ID
+            deployment: 部署信息
+            
+        Returns:
+            部署信息字典
+        """
         return {
             'deployment_id': deployment_id,
             'scene': deployment.scene,
@@ -358,6 +565,50 @@ class SceneManager:
             ]
         }
     
+    def get_deployments_for_device(self, device_gb_code: str) -> List[str]:
+        """
+        获取包含指定设备的所有部署
+        
+        Args:
+            device_gb_code: 设备国标编码
+            
+        Returns:
+            部署ID列表
+        """
+        with self._deployments_lock:
+            return list(self._device_index.get(device_gb_code, ()))
+    
+    def _warn_overlapping_devices(self, devices: List[Dict], scene_id: Optional[str]) -> None:
+        """
+        记录已在其他场景中部署的设备（同一摄像头会被多个场景同时拉流检测）
+        
+        Args:
+            devices: 待部署的设备列表
+            scene_id: 当前场景ID（同一场景的旧部署不视为重叠）
+        """
+        with self._deployments_lock:
+            overlaps = []
+            for device_data in devices:
+                device_gb_code = device_data.get('deviceGbCode')
+                others = self._device_index.get(device_gb_code)
+                if others:
+                    others = sorted(others - {scene_id})
+                    if others:
+                        overlaps.append((device_gb_code, others))
+        
+        for device_gb_code, others in overlaps:
+            self.logger.warning("设备 %s 已在其他场景中部署: %s", device_gb_code, others)
+    
+    def _unindex_devices(self, deployment_id: str, deployment: SceneDeployment) -> None:
+        """从设备索引中移除部署（调用方需持有 _deployments_lock）"""
+        for device_info in deployment.devices:
+            deployment_ids = self._device_index.get(device_info.device_gb_code)
+            if deployment_ids is None:
+                continue
+            deployment_ids.discard(deployment_id)
+            if not deployment_ids:
+                del self._device_index[device_info.device_gb_code]
+    
     def list_deployments(self) -> List[Dict]:
         """
         列出所有部署
@@ -365,10 +616,19 @@ class SceneManager:
         Returns:
             部署列表
         """
-        return [
-            self.get_deployment_info(deployment_id)
-            for deployment_id in self.deployments.keys()
-        ]
+        return list(self._info_cache.values())
+    
+    def _scene_lock(self, scene_id: str) -> threading.RLock:
+        """
+        获取指定场景的操作锁（固定分段锁，不会随场景数量增长）
+        
+        Args:
+            scene_id: 场景ID（即 deployment_id）
+            
+        Returns:
+            该场景所在分段的可重入锁
+        """
+        return self._scene_locks[hash(scene_id) % _SCENE_LOCK_STRIPES]
     
     def stop_deployment(self, deployment_id: str) -> bool:
         """
@@ -380,26 +640,37 @@ class SceneManager:
         Returns:
             是否成功
         """
-        deployment = self.deployments.get(deployment_id)
-        if not deployment:
-            self.logger.warning(f"部署不存在: {deployment_id}")
-            return False
-        
-        # 停止所有设备的检测和心跳
-        for device_info in deployment.devices:
-            if device_info.stream_id:
-                # 先停止检测
-                self.stream_manager.stop_stream(device_info.stream_id)
-                # 再注销流
-                self.stream_manager.unregister_stream(device_info.stream_id)
+        with self._scene_lock(deployment_id):
+            # 先移除部署记录（取出与删除一步完成），再停止设备
+            with self._deployments_lock:
+                deployments = dict(self.deployments)
+                deployment = deployments.pop(deployment_id, None)
+                if deployment is None:
+                    self.logger.warning(f"部署不存在: {deployment_id}")
+                    return False
+                self.deployments = deployments
+                info_cache = dict(self._info_cache)
+                info_cache.pop(deployment_id, None)
+                self._info_cache = info_cache
+                self._unindex_devices(deployment_id, deployment)
+                if not deployments:
+                    # 已无任何部署：丢弃全部残留的堆条目，监控线程将无限期休眠直到下次部署
+                    # （在 _deployments_lock 内清空，保证不会清掉并发部署随后登记的条目）
+                    with self._heap_lock:
+                        self._expiry_heap.clear()
             
-            self.heartbeat_manager.stop_heartbeat(device_info.device_gb_code)
-        
-        # 移除部署记录
-        del self.deployments[deployment_id]
-        
-        self.logger.info(f"部署 {deployment_id} 已停止")
-        return True
+            # 停止所有设备的检测和心跳
+            for device_info in deployment.devices:
+                if device_info.stream_id:
+                    # 先停止检测
+                    self.stream_manager.stop_stream(device_info.stream_id)
+                    # 再注销流
+                    self.stream_manager.unregister_stream(device_info.stream_id)
+                
+                self.heartbeat_manager.stop_heartbeat(device_info.device_gb_code)
+            
+            self.logger.info(f"部署 {deployment_id} 已停止")
+            return True
     
     # API 兼容方法（别名）
     def stop_scene(self, scene_id: str) -> Dict:
@@ -415,35 +686,36 @@ class SceneManager:
         # 转换为字符串
         scene_id_str = str(scene_id)
         
-        # 【简化】直接用 scene_id 查找 deployment
-        deployment = self.deployments.get(scene_id_str)
-        
-        if not deployment:
-            return {
-                'status': 1,
-                'message': f'场景不存在或已停止: {scene_id}'
-            }
-        
-        device_count = len(deployment.devices)
-        
-        # 停止部署（deployment_id 就是 scene_id）
-        success = self.stop_deployment(scene_id_str)
-        
-        if success:
-            self.logger.info(f"场景 {scene_id} 停止成功")
-            return {
-                'status': 0,
-                'message': '场景停止成功',
-                'data': {
-                    'scene_id': scene_id,
-                    'stopped_devices': device_count
+        with self._scene_lock(scene_id_str):
+            # 【简化】直接用 scene_id 查找 deployment
+            deployment = self.deployments.get(scene_id_str)
+            
+            if not deployment:
+                return {
+                    'status': 1,
+                    'message': f'场景不存在或已停止: {scene_id}'
+                }
+            
+            device_count = len(deployment.devices)
+            
+            # 停止部署（deployment_id 就是 scene_id）
+            success = self.stop_deployment(scene_id_str)
+            
+            if success:
+                self.logger.info(f"场景 {scene_id} 停止成功")
+                return {
+                    'status': 0,
+                    'message': '场景停止成功',
+                    'data': {
+                        'scene_id': scene_id,
+                        'stopped_devices': device_count
+                    }
+                }
+            else:
+                return {
+                    'status': 1,
+                    'message': f'场景停止失败: {scene_id}'
                 }
-            }
-        else:
-            return {
-                'status': 1,
-                'message': f'场景停止失败: {scene_id}'
-            }
     
     def deploy_scene_v2(
         self,
@@ -475,101 +747,100 @@ class SceneManager:
         Returns:
             部署结果
         """
-        self.logger.info(f"开始部署场景v2: sceneId={scene_id}, algorithmCode={algorithm_code}, type={date_type}")
-        
-        # 【关键】先停止并清理同 sceneId 的旧场景（符合接入文档要求）
-        # scene_id 已经是字符串类型，不需要转换
-        if scene_id in self.deployments:
-            self.logger.info(f"检测到场景 {scene_id} 已存在，先停止旧场景")
-            self.stop_deployment(scene_id)
-        
-        scene_name = f"scene_{scene_id}"
-        
-        # 时间策略配置
-        allowed_months = None
-        daily_time_start = None
-        daily_time_end = None
-        
-        # 根据 date_type 处理时间
-        if date_type == "1":
-            # Type 1: 完整日期时间范围
-            start_date = start_time  # "2024-06-01 10:00:00"
-            end_date = end_time      # "2025-06-01 10:00:00"
-            self.logger.info(f"Type 1: 完整时间范围 {start_date} 至 {end_date}")
-            
-        elif date_type == "2":
-            # Type 2: 指定月份 + 每天的时间段
-            # 例如: month=[5,6,8,9], start="06:00:00", end="21:00:00"
-            # 意思：在5,6,8,9月，每天的06:00-21:00进行检测
-            from datetime import datetime
-            import calendar
-            current_year = datetime.now().year
-            
-            allowed_months = month if month else list(range(1, 13))  # 如果没有指定月份，默认全年
-            daily_time_start = start_time  # "06:00:00"
-            daily_time_end = end_time      # "21:00:00"
-            
-            # 设置一个大致的开始和结束日期（用于到期检查）
-            # 从今年第一个允许的月份开始，到明年最后一个允许的月份结束
-            first_month = min(allowed_months)
-            last_month = max(allowed_months)
-            start_date = f"{current_year}-{first_month:02d}-01 00:00:00"
-            # 设置为明年，因为是循环的，使用正确的月份天数
-            last_day = calendar.monthrange(current_year + 1, last_month)[1]
-            end_date = f"{current_year + 1}-{last_month:02d}-{last_day} 23:59:59"
-            
-            self.logger.info(
-                f"Type 2: 月份={allowed_months}, 每日时间段={daily_time_start}-{daily_time_end}"
-            )
+        with self._scene_lock(scene_id):
+            self.logger.info("开始部署场景v2: sceneId=%s, algorithmCode=%s, type=%s", scene_id, algorithm_code, date_type)
             
-        else:  # date_type == "3"
-            # Type 3: 每天的时间段，永久有效
-            # 例如: start="06:00:00", end="21:00:00"
-            # 意思：每天的06:00-21:00进行检测，永久有效
-            from datetime import datetime
+            scene_name = f"scene_{scene_id}"
+            now = datetime.now()
             
-            daily_time_start = start_time  # "06:00:00"
-            daily_time_end = end_time      # "21:00:00"
+            # 时间策略配置
+            allowed_months = None
+            daily_time_start = None
+            daily_time_end = None
             
-            # 永久有效：设置为从现在开始，100年后结束
-            today = datetime.now().strftime('%Y-%m-%d')
-            start_date = f"{today} 00:00:00"
-            future_year = datetime.now().year + 100
-            end_date = f"{future_year}-12-31 23:59:59"
+            # 根据 date_type 处理时间
+            if date_type == "1":
+                # Type 1: 完整日期时间范围
+                start_date = start_time  # "2024-06-01 10:00:00"
+                end_date = end_time      # "2025-06-01 10:00:00"
+                self.logger.info("Type 1: 完整时间范围 %s 至 %s", start_date, end_date)
+                
+            elif date_type == "2":
+                # Type 2: 指定月份 + 每天的时间段
+                # 例如: month=[5,6,8,9], start="06:00:00", end="21:00:00"
+                # 意思：在5,6,8,9月，每天的06:00-21:00进行检测
+                current_year = now.year
+                
+                allowed_months = month if month else list(range(1, 13))  # 如果没有指定月份，默认全年
+                daily_time_start = start_time  # "06:00:00"
+                daily_time_end = end_time      # "21:00:00"
+                
+                # 设置一个大致的开始和结束日期（用于到期检查）
+                # 从今年第一个允许的月份开始，到明年最后一个允许的月份结束
+                first_month = min(allowed_months)
+                last_month = max(allowed_months)
+                start_date = f"{current_year}-{first_month:02d}-01 00:00:00"
+                # 设置为明年，因为是循环的，使用正确的月份天数
+                last_day = _month_last_day(current_year + 1, last_month)
+                end_date = f"{current_year + 1}-{last_month:02d}-{last_day} 23:59:59"
+                
+                self.logger.info(
+                    "Type 2: 月份=%s, 每日时间段=%s-%s",
+                    allowed_months, daily_time_start, daily_time_end
+                )
+                
+            else:  # date_type == "3"
+                # Type 3: 每天的时间段，永久有效
+                # 例如: start="06:00:00", end="21:00:00"
+                # 意思：每天的06:00-21:00进行检测，永久有效
+                daily_time_start = start_time  # "06:00:00"
+                daily_time_end = end_time      # "21:00:00"
+                
+                # 永久有效：设置为从现在开始，100年后结束
+                start_date = f"{now:%Y-%m-%d} 00:00:00"
+                future_year = now.year + 100
+                end_date = f"{future_year}-12-31 23:59:59"
+                
+                self.logger.info(
+                    "Type 3: 每日时间段=%s-%s, 永久有效",
+                    daily_time_start, daily_time_end
+                )
             
-            self.logger.info(
-                f"Type 3: 每日时间段={daily_time_start}-{daily_time_end}, 永久有效"
-            )
-        
-        # 调用原有的 deploy_scene 方法，传递时间策略和 sceneId
-        result = self.deploy_scene(
-            scene=scene_name,
-            algorithm=algorithm_code,
-            devices=devices,
-            start_date=start_date,
-            end_date=end_date,
-            date_type=date_type,
-            allowed_months=allowed_months,
-            daily_time_start=daily_time_start,
-            daily_time_end=daily_time_end,
-            scene_id=scene_id  # scene_id 已经是字符串
-        )
-        
-        # 更新时间策略到部署信息中
-        if result.get('status') == 0 and scene_id in self.deployments:
-            deployment = self.deployments[scene_id]
-            deployment.date_type = date_type
-            deployment.allowed_months = allowed_months
-            deployment.daily_time_start = daily_time_start
-            deployment.daily_time_end = daily_time_end
-            
-            self.logger.info(
-                f"场景部署成功: sceneId={scene_id}, "
-                f"type={date_type}, months={allowed_months}, "
-                f"daily={daily_time_start}-{daily_time_end}"
+            # 先校验结束时间，格式错误时直接返回，不影响正在运行的旧场景
+            end_ts = self._parse_end_date(end_date)
+            if end_ts is None:
+                message = f'结束时间格式错误: {end_date}'
+                self.logger.warning("场景 %s %s", scene_id, message)
+                return self._all_devices_failed(message, message, devices)
+            
+            # 【关键】先停止并清理同 sceneId 的旧场景（符合接入文档要求）
+            # scene_id 已经是字符串类型，不需要转换
+            if scene_id in self.deployments:
+                self.logger.info("检测到场景 %s 已存在，先停止旧场景", scene_id)
+                self.stop_deployment(scene_id)
+            
+            # 调用原有的 deploy_scene 方法，传递时间策略和 sceneId
+            result = self.deploy_scene(
+                scene=scene_name,
+                algorithm=algorithm_code,
+                devices=devices,
+                start_date=start_date,
+                end_date=end_date,
+                date_type=date_type,
+                allowed_months=allowed_months,
+                daily_time_start=daily_time_start,
+                daily_time_end=daily_time_end,
+                scene_id=scene_id,  # scene_id 已经是字符串
+                end_ts=end_ts
             )
-        
-        return result
+            
+            if result.get('status') == 0:
+                self.logger.info(
+                    "场景部署成功: sceneId=%s, type=%s, months=%s, daily=%s-%s",
+                    scene_id, date_type, allowed_months, daily_time_start, daily_time_end
+                )
+            
+            return result
     
     def start_scene(self, scene_id: str) -> Dict:
         """
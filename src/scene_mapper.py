@@ -4,11 +4,25 @@
 """
 
 import logging
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
 import os
+import time
+from dataclasses import dataclass
 from .config_manager import config_manager
 
 
+# 模型文件存在性检查结果的缓存时间（秒）
+_EXISTS_CACHE_TTL = 60
+
+
+@dataclass(frozen=True)
+class AlgorithmEntry:
+    """算法映射条目"""
+    model_path: str  # 模型文件路径
+    target_classes: Optional[List[str]] = None  # 目标检测类别（可选）
+    custom_type: Optional[str] = None  # 自定义处理类型（可选）
+
+
 class SceneMapper:
     """算法到模型的映射管理器"""
     
@@ -16,8 +30,8 @@ class SceneMapper:
         """初始化场景映射管理器"""
         self.logger = logging.getLogger(__name__)
         
-        # 从配置文件加载算法模型映射
-        self.algorithm_models = config_manager.get('model.algorithm_models', {})
+        # 从配置文件加载算法映射快照
+        self.reload()
         
         if not self.algorithm_models:
             self.logger.warning("未配置算法模型映射，请在配置文件中添加 model.algorithm_models")
@@ -26,30 +40,98 @@ class SceneMapper:
             for algorithm, model_path in self.algorithm_models.items():
                 self.logger.debug(f"  - {algorithm}: {model_path}")
     
-    def get_model_by_algorithm(self, algorithm_name: str) -> Optional[str]:
+    def reload(self) -> None:
         """
-        根据算法名称获取模型文件路径
+        从配置重新加载算法映射（配置重新加载后调用）
+        
+        映射表整体构建后再替换，读取方不会看到半更新的状态
+        """
+        algorithm_models = config_manager.get('model.algorithm_models', {})
+        algorithm_classes = config_manager.get('model.algorithm_classes', {})
+        algorithm_custom_types = config_manager.get('model.algorithm_custom_types', {})
+        
+        # 预先合并 模型路径/目标类别/自定义类型，查询时只需一次字典查找
+        self._table: Dict[str, AlgorithmEntry] = {
+            algorithm: AlgorithmEntry(
+                model_path=model_path,
+                target_classes=algorithm_classes.get(algorithm),
+                custom_type=algorithm_custom_types.get(algorithm)
+            )
+            for algorithm, model_path in algorithm_models.items()
+        }
+        self.algorithm_models = algorithm_models
+        
+        # 模型文件存在性缓存：model_path -> (检查时间, 是否存在)
+        self._exists_cache: Dict[str, Tuple[float, bool]] = {}
+    
+    def lookup(self, algorithm_name: str) -> Optional[AlgorithmEntry]:
+        """
+        查询算法映射条目（不检查模型文件是否存在）
+        
+        Args:
+            algorithm_name: 算法名称
+            
+        Returns:
+            算法映射条目，如果未配置返回None
+        """
+        return self._table.get(algorithm_name)
+    
+    def resolve(self, algorithm_name: str) -> Optional[Tuple[str, Optional[List[str]], Optional[str]]]:
+        """
+        一次性解析算法对应的模型路径、目标类别和自定义处理类型
         
         Args:
             algorithm_name: 算法名称，如"火焰检测"
             
         Returns:
-            模型文件路径，如果未找到返回None
+            (模型路径, 目标类别, 自定义处理类型)，如果未配置或模型文件不存在返回None
         """
-        model_path = self.algorithm_models.get(algorithm_name)
+        entry = self._table.get(algorithm_name)
         
-        if model_path:
+        if entry and entry.model_path:
             # 检查模型文件是否存在
-            if os.path.exists(model_path):
-                self.logger.info(f"算法 '{algorithm_name}' -> 模型: {model_path}")
-                return model_path
+            if self._model_exists(entry.model_path):
+                self.logger.info(f"算法 '{algorithm_name}' -> 模型: {entry.model_path}")
+                return entry.model_path, entry.target_classes, entry.custom_type
             else:
-                self.logger.warning(f"算法 '{algorithm_name}' 的模型文件不存在: {model_path}")
+                self.logger.warning(f"算法 '{algorithm_name}' 的模型文件不存在: {entry.model_path}")
                 return None
         
         self.logger.warning(f"未找到算法 '{algorithm_name}' 的配置，请检查 model.algorithm_models")
         return None
     
+    def get_model_by_algorithm(self, algorithm_name: str) -> Optional[str]:
+        """
+        根据算法名称获取模型文件路径
+        
+        Args:
+            algorithm_name: 算法名称，如"火焰检测"
+            
+        Returns:
+            模型文件路径，如果未找到返回None
+        """
+        resolved = self.resolve(algorithm_name)
+        return resolved[0] if resolved else None
+    
+    def _model_exists(self, model_path: str) -> bool:
+        """
+        检查模型文件是否存在（结果缓存 _EXISTS_CACHE_TTL 秒，避免每次部署都访问文件系统）
+        
+        Args:
+            model_path: 模型文件路径
+            
+        Returns:
+            是否存在
+        """
+        now = time.monotonic()
+        cached = self._exists_cache.get(model_path)
+        if cached is not None and now - cached[0] < _EXISTS_CACHE_TTL:
+            return cached[1]
+        
+        exists = os.path.exists(model_path)
+        self._exists_cache[model_path] = (now, exists)
+        return exists
+    
     def get_target_classes_by_algorithm(self, algorithm_name: str) -> Optional[List[str]]:
         """
         根据算法名称获取目标检测类别（可选）
@@ -62,8 +144,8 @@ class SceneMapper:
         """
         # 可以根据需要在配置文件中添加类别过滤配置
         # 例如: model.algorithm_classes.火焰检测 = ["fire", "smoke"]
-        algorithm_classes = config_manager.get('model.algorithm_classes', {})
-        return algorithm_classes.get(algorithm_name)
+        entry = self._table.get(algorithm_name)
+        return entry.target_classes if entry else None
     
     def get_custom_type_by_algorithm(self, algorithm_name: str) -> Optional[str]:
         """
@@ -75,8 +157,8 @@ class SceneMapper:
         Returns:
             自定义处理类型，如 "helmet_detection_alert"，如果未配置则返回None
         """
-        algorithm_custom_types = config_manager.get('model.algorithm_custom_types', {})
-        return algorithm_custom_types.get(algorithm_name)
+        entry = self._table.get(algorithm_name)
+        return entry.custom_type if entry else None
     
     def get_all_algorithms(self) -> List[str]:
         """
@@ -107,12 +189,11 @@ class SceneMapper:
             算法配置字典
         """
         info = {}
-        algorithm_classes = config_manager.get('model.algorithm_classes', {})
         
-        for algorithm, model_path in self.algorithm_models.items():
+        for algorithm, entry in self._table.items():
             info[algorithm] = {
-                'model_path': model_path,
-                'exists': os.path.exists(model_path),
-                'target_classes': algorithm_classes.get(algorithm, [])
+                'model_path': entry.model_path,
+                'exists': self._model_exists(entry.model_path),
+                'target_classes': entry.target_classes or []
             }
         return info
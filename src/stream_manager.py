@@ -3,16 +3,29 @@
 负责管理RTSP流的注册、删除和状态监控
 """
 
+import heapq
+import itertools
 import logging
 import time
 import threading
-from typing import Dict, List, Optional, Callable, Any
-from dataclasses import dataclass, asdict
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Callable, Any, Tuple
+from dataclasses import dataclass, field, fields
 from enum import Enum
 from .detection_engine import DetectionEngine, DetectionResult, AlarmEvent, StreamEvent
 from .config_manager import config_manager
 
 
+# 活跃流无新帧的超时时间（秒）
+_ACTIVE_TIMEOUT = 60
+# 重连状态的超时时间（秒）
+_RECONNECT_TIMEOUT = 120
+
+# 流变更版本号的全局来源：多个线程会更新同一个流，next() 在 CPython 中是原子的，
+# 不会像 version += 1 那样丢失更新
+_version_counter = itertools.count(1)
+
+
 class StreamStatus(Enum):
     """视频流状态枚举"""
     INACTIVE = "inactive"      # 未激活
@@ -22,7 +35,14 @@ class StreamStatus(Enum):
     RECONNECTING = "reconnecting"  # 重连中
 
 
-@dataclass
+# 各状态计数为0的模板（统计时复制使用）
+_STATUS_COUNT_TEMPLATE = {status.value: 0 for status in StreamStatus}
+
+# 收到新检测结果时可恢复为活跃的状态
+_RECOVERABLE_STATES = frozenset((StreamStatus.ERROR, StreamStatus.RECONNECTING))
+
+
+@dataclass(slots=True)
 class StreamConfig:
     """视频流配置"""
     stream_id: str
@@ -45,6 +65,9 @@ class StreamConfig:
     allowed_months: List[int] = None  # 允许的月份列表（Type 2）
     daily_time_start: str = ""  # 每日开始时间 HH:mm:ss（Type 2和3）
     daily_time_end: str = ""  # 每日结束时间 HH:mm:ss（Type 2和3）
+    # to_dict() / detection_params() 结果缓存，任意配置字段被重新赋值时失效
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    _detection_params_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.tags is None:
@@ -53,28 +76,96 @@ class StreamConfig:
             self.target_classes = []
         if self.allowed_months is None:
             self.allowed_months = []
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if not name.startswith('_'):
+            object.__setattr__(self, '_dict_cache', None)
+            object.__setattr__(self, '_detection_params_cache', None)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为字典（结果缓存，替代每次调用 dataclasses.asdict 的反射与深拷贝）
+        
+        Returns:
+            配置字典，列表字段为副本
+        """
+        cached = self._dict_cache
+        if cached is None:
+            cached = {name: getattr(self, name) for name in _STREAM_CONFIG_FIELDS}
+            self._dict_cache = cached
+        return {
+            name: list(value) if isinstance(value, list) else value
+            for name, value in cached.items()
+        }
+    
+    def detection_params(self) -> Dict[str, Any]:
+        """
+        获取传给检测引擎的检测参数（结果缓存，调用方不应修改返回值）
+        
+        Returns:
+            检测参数字典
+        """
+        params = self._detection_params_cache
+        if params is None:
+            params = {
+                'confidence_threshold': self.confidence_threshold,
+                'iou_threshold': self.iou_threshold,
+                'fps_limit': self.fps_limit
+            }
+            self._detection_params_cache = params
+        return params
+
 
+# StreamConfig 对外输出的字段名（不含内部缓存字段）
+_STREAM_CONFIG_FIELDS = tuple(f.name for f in fields(StreamConfig) if not f.name.startswith('_'))
 
-@dataclass
+
+@dataclass(slots=True)
 class StreamInfo:
     """视频流信息"""
     config: StreamConfig
     status: StreamStatus
     created_time: float
     last_active_time: float
+    # 最近活跃时间（time.monotonic()，仅用于超时判断，不受系统时间调整影响）
+    last_active_monotonic: float = 0.0
     frame_count: int = 0
     detection_count: int = 0
     error_count: int = 0
     last_error: str = ""
-    performance_stats: Dict[str, Any] = None
+    # 性能统计（逐帧更新，使用标量字段避免字典写入）
+    average_fps: float = 0.0
+    average_processing_time: float = 0.0
+    total_detections: int = 0
+    # 变更版本号：状态/计数/配置每次变化后从 _version_counter 取新值，摘要与详情按版本号缓存
+    version: int = 0
+    _summary_cache: Optional[Tuple[int, Dict[str, Any]]] = field(default=None, repr=False, compare=False)
+    _detail_cache: Optional[Tuple[int, Dict[str, Any]]] = field(default=None, repr=False, compare=False)
+    # status.value 的缓存，随 set_status 一起更新
+    status_value: str = field(default="", init=False)
     
     def __post_init__(self):
-        if self.performance_stats is None:
-            self.performance_stats = {
-                'average_fps': 0.0,
-                'average_processing_time': 0.0,
-                'total_detections': 0
-            }
+        self.status_value = self.status.value
+    
+    def set_status(self, status: StreamStatus) -> None:
+        """
+        设置流状态（同时更新状态字符串缓存）
+        
+        Args:
+            status: 新状态
+        """
+        self.status = status
+        self.status_value = status.value
+    
+    @property
+    def performance_stats(self) -> Dict[str, Any]:
+        """性能统计字典（对外输出格式）"""
+        return {
+            'average_fps': self.average_fps,
+            'average_processing_time': self.average_processing_time,
+            'total_detections': self.total_detections
+        }
 
 
 class StreamManager:
@@ -91,8 +182,10 @@ class StreamManager:
         self.detection_engine = detection_engine
         
         # 流管理
-        self.streams: Dict[str, StreamInfo] = {}
-        self.stream_lock = threading.RLock()
+        # streams 为只读快照，写入方在 stream_lock 内复制后整体替换（读取方无需加锁）
+        # stream_lock 不可重入：持锁期间不得再调用 start_stream/stop_stream 等加锁方法
+        self.streams: Mapping[str, StreamInfo] = MappingProxyType({})
+        self.stream_lock = threading.Lock()
         
         # 配置参数
         self.max_streams = config_manager.get('detection.max_streams', 10)
@@ -101,6 +194,12 @@ class StreamManager:
         self.monitor_thread: Optional[threading.Thread] = None
         self.monitor_running = False
         
+        # 超时检查最小堆：(检查时间, stream_id)；每个流只保留一个有效条目，其检查时间记录在 _monitor_deadlines
+        self._monitor_heap: List[Tuple[float, str]] = []
+        self._monitor_deadlines: Dict[str, float] = {}
+        self._monitor_lock = threading.Lock()
+        self._monitor_wake = threading.Event()
+        
         # 回调函数注册
         self.detection_callbacks: Dict[str, Callable] = {}
         self.alarm_callbacks: Dict[str, Callable] = {}
@@ -152,11 +251,14 @@ class StreamManager:
                     config=config,
                     status=StreamStatus.INACTIVE,
                     created_time=current_time,
-                    last_active_time=current_time
+                    last_active_time=current_time,
+                    last_active_monotonic=time.monotonic()
                 )
                 
                 # 添加到管理器
-                self.streams[config.stream_id] = stream_info
+                streams = dict(self.streams)
+                streams[config.stream_id] = stream_info
+                self.streams = MappingProxyType(streams)
                 
                 self.logger.info(f"视频流注册成功: {config.stream_id}")
                 
@@ -194,11 +296,18 @@ class StreamManager:
                 }
             
             try:
-                # 停止检测
-                self.stop_stream(stream_id)
+                # 停止检测（已持有 stream_lock，直接调用检测引擎；失败不影响注销）
+                try:
+                    self.detection_engine.stop_detection(stream_id)
+                except Exception as e:
+                    self.logger.error(f"停止视频流失败: {e}")
                 
                 # 移除流信息
-                stream_info = self.streams.pop(stream_id)
+                streams = dict(self.streams)
+                stream_info = streams.pop(stream_id)
+                self.streams = MappingProxyType(streams)
+                stream_info.set_status(StreamStatus.INACTIVE)
+                stream_info.version = next(_version_counter)
                 
                 # 清理回调
                 self.detection_callbacks.pop(stream_id, None)
@@ -248,64 +357,73 @@ class StreamManager:
                     'stream_id': stream_id
                 }
             
-            try:
-                # 更新状态
-                stream_info.status = StreamStatus.CONNECTING
-                stream_info.last_active_time = time.time()
-                
-                # 准备检测参数
-                config = stream_info.config
-                detection_params = {
-                    'confidence_threshold': config.confidence_threshold,
-                    'iou_threshold': config.iou_threshold,
-                    'fps_limit': config.fps_limit
+            if stream_info.status == StreamStatus.CONNECTING:
+                return {
+                    'success': False,
+                    'error': f'视频流正在启动: {stream_id}',
+                    'stream_id': stream_id
                 }
-                
-                # 启动检测
-                success = self.detection_engine.start_detection(
-                    stream_id=stream_id,
-                    video_source=config.rtsp_url,
-                    custom_params=detection_params,
-                    model_path=config.model_path if config.model_path else None,
-                    target_classes=config.target_classes if config.target_classes else None,
-                    custom_type=config.custom_type if config.custom_type else None  # 传递custom_type
-                )
-                
+            
+            # 更新状态（CONNECTING 同时作为启动中的占位，阻止重复启动）
+            stream_info.set_status(StreamStatus.CONNECTING)
+            stream_info.last_active_time = time.time()
+            stream_info.last_active_monotonic = time.monotonic()
+            stream_info.version = next(_version_counter)
+            config = stream_info.config
+        
+        # 启动检测（加载模型、打开视频源均为阻塞I/O，在锁外进行，多个流可以并行启动）
+        error = None
+        try:
+            success = self.detection_engine.start_detection(
+                stream_id=stream_id,
+                video_source=config.rtsp_url,
+                custom_params=config.detection_params(),
+                model_path=config.model_path if config.model_path else None,
+                target_classes=config.target_classes if config.target_classes else None,
+                custom_type=config.custom_type if config.custom_type else None  # 传递custom_type
+            )
+        except Exception as e:
+            success = False
+            error = e
+            self.logger.error(f"启动视频流失败: {e}")
+        
+        with self.stream_lock:
+            # 启动期间流已被停止或注销：撤销刚启动的检测
+            if self.streams.get(stream_id) is not stream_info or stream_info.status == StreamStatus.INACTIVE:
                 if success:
-                    stream_info.status = StreamStatus.ACTIVE
-                    stream_info.error_count = 0
-                    stream_info.last_error = ""
-                    
-                    self.logger.info(f"视频流启动成功: {stream_id}")
-                    
-                    return {
-                        'success': True,
-                        'message': '视频流启动成功',
-                        'stream_id': stream_id,
-                        'stream_info': self._get_stream_summary(stream_info)
-                    }
-                else:
-                    stream_info.status = StreamStatus.ERROR
-                    stream_info.error_count += 1
-                    stream_info.last_error = "启动检测失败"
-                    
-                    return {
-                        'success': False,
-                        'error': '启动检测失败',
-                        'stream_id': stream_id
-                    }
-                    
-            except Exception as e:
-                stream_info.status = StreamStatus.ERROR
-                stream_info.error_count += 1
-                stream_info.last_error = str(e)
-                
-                self.logger.error(f"启动视频流失败: {e}")
+                    self.detection_engine.stop_detection(stream_id)
                 return {
                     'success': False,
-                    'error': f'启动失败: {str(e)}',
+                    'error': f'启动期间视频流已被停止: {stream_id}',
                     'stream_id': stream_id
                 }
+            
+            if success:
+                stream_info.set_status(StreamStatus.ACTIVE)
+                stream_info.error_count = 0
+                stream_info.last_error = ""
+                stream_info.version = next(_version_counter)
+                self._schedule_timeout_check(stream_id, stream_info.last_active_monotonic + _ACTIVE_TIMEOUT)
+                
+                self.logger.info(f"视频流启动成功: {stream_id}")
+                
+                return {
+                    'success': True,
+                    'message': '视频流启动成功',
+                    'stream_id': stream_id,
+                    'stream_info': self._get_stream_summary(stream_info)
+                }
+            
+            stream_info.set_status(StreamStatus.ERROR)
+            stream_info.error_count += 1
+            stream_info.last_error = str(error) if error is not None else "启动检测失败"
+            stream_info.version = next(_version_counter)
+            
+            return {
+                'success': False,
+                'error': f'启动失败: {str(error)}' if error is not None else '启动检测失败',
+                'stream_id': stream_id
+            }
     
     def stop_stream(self, stream_id: str) -> Dict[str, Any]:
         """
@@ -332,7 +450,8 @@ class StreamManager:
                 success = self.detection_engine.stop_detection(stream_id)
                 
                 # 更新状态
-                stream_info.status = StreamStatus.INACTIVE
+                stream_info.set_status(StreamStatus.INACTIVE)
+                stream_info.version = next(_version_counter)
                 
                 if success:
                     self.logger.info(f"视频流停止成功: {stream_id}")
@@ -367,12 +486,11 @@ class StreamManager:
         Returns:
             流信息字典
         """
-        with self.stream_lock:
-            if stream_id not in self.streams:
-                return None
-            
-            stream_info = self.streams[stream_id]
-            return self._get_stream_detail(stream_info)
+        stream_info = self.streams.get(stream_id)
+        if stream_info is None:
+            return None
+        
+        return self._get_stream_detail(stream_info)
     
     def get_all_streams(self) -> List[Dict[str, Any]]:
         """
@@ -381,11 +499,19 @@ class StreamManager:
         Returns:
             所有流信息列表
         """
-        with self.stream_lock:
-            return [
-                self._get_stream_summary(stream_info)
-                for stream_info in self.streams.values()
-            ]
+        return [
+            self._get_stream_summary(stream_info)
+            for stream_info in self.streams.values()
+        ]
+    
+    def get_stream_count(self) -> int:
+        """
+        获取已注册的视频流数量
+        
+        Returns:
+            流数量
+        """
+        return len(self.streams)
     
     def get_stream_stats(self) -> Dict[str, Any]:
         """
@@ -394,27 +520,25 @@ class StreamManager:
         Returns:
             统计信息字典
         """
-        with self.stream_lock:
-            status_count = {}
-            for status in StreamStatus:
-                status_count[status.value] = 0
-            
-            total_frames = 0
-            total_detections = 0
-            
-            for stream_info in self.streams.values():
-                status_count[stream_info.status.value] += 1
-                total_frames += stream_info.frame_count
-                total_detections += stream_info.detection_count
-            
-            return {
-                'total_streams': len(self.streams),
-                'max_streams': self.max_streams,
-                'status_distribution': status_count,
-                'total_frames_processed': total_frames,
-                'total_detections': total_detections,
-                'engine_stats': self.detection_engine.get_stats()
-            }
+        streams = self.streams
+        status_count = _STATUS_COUNT_TEMPLATE.copy()
+        
+        total_frames = 0
+        total_detections = 0
+        
+        for stream_info in streams.values():
+            status_count[stream_info.status_value] += 1
+            total_frames += stream_info.frame_count
+            total_detections += stream_info.detection_count
+        
+        return {
+            'total_streams': len(streams),
+            'max_streams': self.max_streams,
+            'status_distribution': status_count,
+            'total_frames_processed': total_frames,
+            'total_detections': total_detections,
+            'engine_stats': self.detection_engine.get_stats()
+        }
     
     def update_stream_config(self, stream_id: str, 
                            config_updates: Dict[str, Any]) -> Dict[str, Any]:
@@ -442,25 +566,11 @@ class StreamManager:
                 
                 # 更新配置
                 for key, value in config_updates.items():
-                    if hasattr(config, key):
+                    if key in _STREAM_CONFIG_FIELDS:
                         setattr(config, key, value)
+                stream_info.version = next(_version_counter)
                 
-                # 如果流正在运行，需要重启以应用新配置
                 was_active = stream_info.status == StreamStatus.ACTIVE
-                if was_active:
-                    self.stop_stream(stream_id)
-                    time.sleep(1)  # 等待停止完成
-                    self.start_stream(stream_id)
-                
-                self.logger.info(f"视频流配置更新成功: {stream_id}")
-                
-                return {
-                    'success': True,
-                    'message': '配置更新成功',
-                    'stream_id': stream_id,
-                    'restarted': was_active,
-                    'updated_config': asdict(config)
-                }
                 
             except Exception as e:
                 self.logger.error(f"更新视频流配置失败: {e}")
@@ -469,6 +579,22 @@ class StreamManager:
                     'error': f'更新失败: {str(e)}',
                     'stream_id': stream_id
                 }
+        
+        # 如果流正在运行，需要重启以应用新配置（在锁外进行，等待期间不阻塞其他流的操作）
+        if was_active:
+            self.stop_stream(stream_id)
+            time.sleep(1)  # 等待停止完成
+            self.start_stream(stream_id)
+        
+        self.logger.info(f"视频流配置更新成功: {stream_id}")
+        
+        return {
+            'success': True,
+            'message': '配置更新成功',
+            'stream_id': stream_id,
+            'restarted': was_active,
+            'updated_config': config.to_dict()
+        }
     
     def register_callback(self, stream_id: str, callback_type: str, 
                          callback_func: Callable) -> bool:
@@ -508,80 +634,89 @@ class StreamManager:
         stream_id = result.stream_id
         
         # 更新流信息
-        if stream_id in self.streams:
-            stream_info = self.streams[stream_id]
+        stream_info = self.streams.get(stream_id)
+        if stream_info is not None:
             stream_info.frame_count = result.frame_id
             stream_info.detection_count += result.bbox_count
             stream_info.last_active_time = result.timestamp
+            stream_info.last_active_monotonic = time.monotonic()
             
             # 如果流之前有错误，现在恢复正常，更新状态
-            if stream_info.status in [StreamStatus.ERROR, StreamStatus.RECONNECTING]:
-                stream_info.status = StreamStatus.ACTIVE
+            if stream_info.status in _RECOVERABLE_STATES:
+                stream_info.set_status(StreamStatus.ACTIVE)
                 stream_info.last_error = ""
-                self.logger.info(f"流 {stream_id} 状态恢复为活跃")
+                self._schedule_timeout_check(stream_id, stream_info.last_active_monotonic + _ACTIVE_TIMEOUT)
+                self.logger.info("流 %s 状态恢复为活跃", stream_id)
             
             # 更新性能统计
-            if result.processing_time > 0:
-                stats = stream_info.performance_stats
-                stats['total_detections'] += result.bbox_count
-                stats['average_processing_time'] = result.processing_time
-                stats['average_fps'] = 1.0 / result.processing_time if result.processing_time > 0 else 0
+            processing_time = result.processing_time
+            if processing_time > 0:
+                stream_info.total_detections += result.bbox_count
+                stream_info.average_processing_time = processing_time
+                stream_info.average_fps = 1.0 / processing_time
+            
+            stream_info.version = next(_version_counter)
         
         # 调用用户注册的回调
-        if stream_id in self.detection_callbacks:
+        callback = self.detection_callbacks.get(stream_id)
+        if callback is not None:
             try:
-                self.detection_callbacks[stream_id](result)
+                callback(result)
             except Exception as e:
-                self.logger.error(f"用户检测回调执行失败: {e}")
+                self.logger.error("用户检测回调执行失败: %s", e)
     
     def _on_alarm_event(self, alarm: AlarmEvent) -> None:
         """处理报警事件回调"""
         stream_id = alarm.stream_id
         
         # 调用用户注册的回调
-        if stream_id in self.alarm_callbacks:
+        callback = self.alarm_callbacks.get(stream_id)
+        if callback is not None:
             try:
-                self.alarm_callbacks[stream_id](alarm)
+                callback(alarm)
             except Exception as e:
-                self.logger.error(f"用户报警回调执行失败: {e}")
+                self.logger.error("用户报警回调执行失败: %s", e)
         
         # 记录报警日志
         self.logger.warning(
-            f"报警事件: 流ID={stream_id}, 类型={alarm.alarm_type}, "
-            f"目标={alarm.class_name}, 置信度={alarm.confidence:.2f}"
+            "报警事件: 流ID=%s, 类型=%s, 目标=%s, 置信度=%.2f",
+            stream_id, alarm.alarm_type, alarm.class_name, alarm.confidence
         )
     
     def _on_stream_event(self, event: StreamEvent) -> None:
         """处理流状态事件回调"""
         stream_id = event.stream_id
         
-        if stream_id in self.streams:
-            stream_info = self.streams[stream_id]
-            
+        stream_info = self.streams.get(stream_id)
+        if stream_info is not None:
             if event.event_type == "disconnected":
                 # 流断开，更新状态
-                stream_info.status = StreamStatus.ERROR
+                stream_info.set_status(StreamStatus.ERROR)
                 stream_info.error_count += 1
                 stream_info.last_error = event.message
-                self.logger.info(f"流 {stream_id} 已断开: {event.message}")
+                self.logger.info("流 %s 已断开: %s", stream_id, event.message)
                 
             elif event.event_type == "reconnecting":
                 # 流重连中
-                stream_info.status = StreamStatus.RECONNECTING
-                self.logger.info(f"流 {stream_id} 重连中: {event.message}")
+                stream_info.set_status(StreamStatus.RECONNECTING)
+                self._schedule_timeout_check(stream_id, stream_info.last_active_monotonic + _RECONNECT_TIMEOUT)
+                self.logger.info("流 %s 重连中: %s", stream_id, event.message)
                 
             elif event.event_type == "connected":
                 # 流连接成功
-                stream_info.status = StreamStatus.ACTIVE
+                stream_info.set_status(StreamStatus.ACTIVE)
                 stream_info.last_error = ""
-                self.logger.info(f"流 {stream_id} 已连接: {event.message}")
+                self._schedule_timeout_check(stream_id, stream_info.last_active_monotonic + _ACTIVE_TIMEOUT)
+                self.logger.info("流 %s 已连接: %s", stream_id, event.message)
                 
             elif event.event_type == "error":
                 # 流错误
-                stream_info.status = StreamStatus.ERROR
+                stream_info.set_status(StreamStatus.ERROR)
                 stream_info.error_count += 1
                 stream_info.last_error = event.message
-                self.logger.error(f"流 {stream_id} 错误: {event.message}")
+                self.logger.error("流 %s 错误: %s", stream_id, event.message)
+            
+            stream_info.version = next(_version_counter)
     
     def start_monitor(self) -> None:
         """启动监控线程"""
@@ -597,48 +732,108 @@ class StreamManager:
     def stop_monitor(self) -> None:
         """停止监控线程"""
         self.monitor_running = False
+        self._monitor_wake.set()
         if self.monitor_thread and self.monitor_thread.is_alive():
             self.monitor_thread.join(timeout=5.0)
         self.logger.info("流监控线程停止")
     
+    def _schedule_timeout_check(self, stream_id: str, deadline: float) -> None:
+        """
+        登记流的超时检查时间
+        
+        已有更早的检查时无需重复登记：到点检查时会按最新的活跃时间重新登记
+        
+        Args:
+            stream_id: 视频流ID
+            deadline: 检查时间（time.monotonic() 时间）
+        """
+        with self._monitor_lock:
+            current = self._monitor_deadlines.get(stream_id)
+            if current is not None and current <= deadline:
+                return
+            self._monitor_deadlines[stream_id] = deadline
+            heapq.heappush(self._monitor_heap, (deadline, stream_id))
+            is_earliest = self._monitor_heap[0][1] == stream_id
+        
+        if is_earliest:
+            # 新的检查时间早于监控线程当前的等待时间，唤醒其重新计算
+            self._monitor_wake.set()
+    
     def _monitor_streams(self) -> None:
-        """监控视频流状态"""
+        """监控视频流状态（按最早的检查时间休眠，而不是定时扫描全部流）"""
         while self.monitor_running:
             try:
-                current_time = time.time()
+                with self._monitor_lock:
+                    timeout = self._monitor_heap[0][0] - time.monotonic() if self._monitor_heap else None
                 
-                with self.stream_lock:
-                    for stream_id, stream_info in self.streams.items():
-                        # 检查超时
-                        if (stream_info.status == StreamStatus.ACTIVE and
-                            current_time - stream_info.last_active_time > 60):  # 60秒超时
-                            
-                            self.logger.warning(f"检测到流超时: {stream_id}")
-                            stream_info.status = StreamStatus.ERROR
-                            stream_info.error_count += 1
-                            stream_info.last_error = "流超时"
-                            
-                        # 检查是否有长时间处于重连状态的流
-                        elif (stream_info.status == StreamStatus.RECONNECTING and
-                              current_time - stream_info.last_active_time > 120):  # 120秒重连超时
-                            
-                            self.logger.error(f"流重连超时: {stream_id}")
-                            stream_info.status = StreamStatus.ERROR
-                            stream_info.error_count += 1
-                            stream_info.last_error = "重连超时"
+                if timeout is None or timeout > 0:
+                    self._monitor_wake.wait(timeout)
+                    self._monitor_wake.clear()
                 
-                time.sleep(10)  # 每10秒检查一次
+                # 取出所有到期的检查（已被更新过检查时间的旧条目直接丢弃）
+                current_time = time.monotonic()
+                due = []
+                with self._monitor_lock:
+                    while self._monitor_heap and self._monitor_heap[0][0] <= current_time:
+                        deadline, stream_id = heapq.heappop(self._monitor_heap)
+                        if self._monitor_deadlines.get(stream_id) == deadline:
+                            del self._monitor_deadlines[stream_id]
+                            due.append(stream_id)
+                
+                for stream_id in due:
+                    self._check_stream_timeout(stream_id, current_time)
                 
             except Exception as e:
                 self.logger.error(f"监控线程异常: {e}")
                 time.sleep(5)
     
+    def _check_stream_timeout(self, stream_id: str, current_time: float) -> None:
+        """
+        检查单个流是否超时，未超时则按最新活跃时间重新登记检查
+        
+        Args:
+            stream_id: 视频流ID
+            current_time: 当前时间（time.monotonic()）
+        """
+        stream_info = self.streams.get(stream_id)
+        if stream_info is None:
+            return
+        
+        if stream_info.status == StreamStatus.ACTIVE:
+            deadline = stream_info.last_active_monotonic + _ACTIVE_TIMEOUT
+            if current_time >= deadline:
+                self.logger.warning(f"检测到流超时: {stream_id}")
+                stream_info.set_status(StreamStatus.ERROR)
+                stream_info.error_count += 1
+                stream_info.last_error = "流超时"
+                stream_info.version = next(_version_counter)
+            else:
+                self._schedule_timeout_check(stream_id, deadline)
+        
+        # 检查是否有长时间处于重连状态的流
+        elif stream_info.status == StreamStatus.RECONNECTING:
+            deadline = stream_info.last_active_monotonic + _RECONNECT_TIMEOUT
+            if current_time >= deadline:
+                self.logger.error(f"流重连超时: {stream_id}")
+                stream_info.set_status(StreamStatus.ERROR)
+                stream_info.error_count += 1
+                stream_info.last_error = "重连超时"
+                stream_info.version = next(_version_counter)
+            else:
+                self._schedule_timeout_check(stream_id, deadline)
+    
     def _get_stream_summary(self, stream_info: StreamInfo) -> Dict[str, Any]:
-        """获取流的摘要信息"""
-        return {
+        """获取流的摘要信息（按版本号缓存，调用方不应修改返回值）"""
+        # 先取版本号再构建：构建期间若有并发更新，缓存的旧版本号会使下次调用重建
+        version = stream_info.version
+        cached = stream_info._summary_cache
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        summary = {
             'stream_id': stream_info.config.stream_id,
             'name': stream_info.config.name,
-            'status': stream_info.status.value,
+            'status': stream_info.status_value,
             'rtsp_url': stream_info.config.rtsp_url,
             'created_time': stream_info.created_time,
             'last_active_time': stream_info.last_active_time,
@@ -646,12 +841,19 @@ class StreamManager:
             'detection_count': stream_info.detection_count,
             'error_count': stream_info.error_count
         }
+        stream_info._summary_cache = (version, summary)
+        return summary
     
     def _get_stream_detail(self, stream_info: StreamInfo) -> Dict[str, Any]:
-        """获取流的详细信息"""
-        return {
-            'config': asdict(stream_info.config),
-            'status': stream_info.status.value,
+        """获取流的详细信息（按版本号缓存，调用方不应修改返回值）"""
+        version = stream_info.version
+        cached = stream_info._detail_cache
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        detail = {
+            'config': stream_info.config.to_dict(),
+            'status': stream_info.status_value,
             'created_time': stream_info.created_time,
             'last_active_time': stream_info.last_active_time,
             'frame_count': stream_info.frame_count,
@@ -660,6 +862,8 @@ class StreamManager:
             'last_error': stream_info.last_error,
             'performance_stats': stream_info.performance_stats
         }
+        stream_info._detail_cache = (version, detail)
+        return detail
     
     def shutdown(self) -> None:
         """关闭流管理器"""
@@ -668,10 +872,8 @@ class StreamManager:
         # 停止监控
         self.stop_monitor()
         
-        # 停止所有流
-        with self.stream_lock:
-            stream_ids = list(self.streams.keys())
-            for stream_id in stream_ids:
-                self.stop_stream(stream_id)
+        # 停止所有流（遍历当前快照，stop_stream 不会修改它）
+        for stream_id in self.streams:
+            self.stop_stream(stream_id)
         
         self.logger.info("流管理器已关闭")